@@ -23,6 +23,7 @@ def setup_files(tmp_path, monkeypatch):
     monkeypatch.setattr(vf, "REFLECTIONS_FILE", refs)
     monkeypatch.setattr(vf, "RITUALS_FILE", rituals)
     monkeypatch.setattr(vf, "REACTIONS_FILE", reactions)
+    monkeypatch.setattr(vf, "ROLLUPS_FILE", tmp_path / "rollups.json")
 
 
 def test_chain_ritual_awards_xp(tmp_path, monkeypatch):
@@ -41,6 +42,9 @@ def test_chain_ritual_awards_xp(tmp_path, monkeypatch):
     rituals = json.loads((tmp_path / "rituals.json").read_text())
     assert rituals[0]["type"] == "ChainRitual"
     assert set(rituals[0]["participants"]) == {"u1", "u2", "u3"}
+    day = vf.load_rollups()["daily"]["2024-01-01"]
+    assert day["chain_rituals"] == 1
+    assert day["xp_awarded"] == 235 * 3
 
 
 def test_chain_ritual_respects_window(tmp_path, monkeypatch):
@@ -62,10 +66,102 @@ def test_reactions_stored(tmp_path, monkeypatch):
     setup_files(tmp_path, monkeypatch)
     base = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
     vf.process_reflection("u1", "hope " * 31, True, "#111", now=base)
+    vf.process_reflection("u2", "hope " * 31, True, "#222", now=base)
     reflections = json.loads((tmp_path / "reflections.json").read_text())
-    ts = reflections[0]["timestamp"]
-    vf.add_reaction(ts, "👏")
-    vf.add_reaction(ts, "🔥")
+    assert [r["id"] for r in reflections] == [0, 1]
+    vf.add_reaction(1, "👏")
+    vf.add_reaction(1, "🔥")
     reactions = json.loads((tmp_path / "reactions.json").read_text())
-    assert reactions[ts]["👏"] == 1
-    assert reactions[ts]["🔥"] == 1
+    assert reactions["by_id"]["1"]["👏"] == 1
+    assert reactions["by_id"]["1"]["🔥"] == 1
+    assert vf.get_reactions([0, 1]) == {0: {}, 1: {"👏": 1, "🔥": 1, "💭": 0}}
+
+
+def test_most_reacted_ordering(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    vf.add_reaction(0, "👏")
+    vf.add_reaction(1, "🔥")
+    vf.add_reaction(2, "💭")
+    vf.add_reaction(2, "👏")
+    vf.add_reaction(1, "👏")
+    vf.add_reaction(1, "💭")
+    assert vf.most_reacted() == [1, 2, 0]
+    assert vf.most_reacted(limit=2) == [1, 2]
+
+
+def test_reaction_ranking_stays_sorted(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    for ref_id in [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5, 8, 9, 7, 9, 3, 2, 3]:
+        vf.add_reaction(ref_id, "👏")
+    index = vf.load_reactions()
+    totals = [index["totals"][str(i)] for i in index["ranking"]]
+    assert totals == sorted(totals, reverse=True)
+    assert index["ranking"][0] == 3
+    assert {int(k): v for k, v in index["positions"].items()} == {
+        ref_id: pos for pos, ref_id in enumerate(index["ranking"])
+    }
+
+
+def test_timestamp_reactions_migrated(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    legacy = [
+        {"user": "u1", "timestamp": "2024-01-01T12:00:00+00:00", "content": "a", "public": True},
+        {"user": "u2", "timestamp": "2024-01-01T12:05:00+00:00", "content": "b", "public": True},
+    ]
+    (tmp_path / "reflections.json").write_text(json.dumps(legacy))
+    (tmp_path / "reactions.json").write_text(
+        json.dumps({"2024-01-01T12:05:00+00:00": {"👏": 2, "🔥": 0, "💭": 1}})
+    )
+    assert vf.get_reactions([1]) == {1: {"👏": 2, "🔥": 0, "💭": 1}}
+    assert vf.most_reacted() == [1]
+    reflections = json.loads((tmp_path / "reflections.json").read_text())
+    assert [r["id"] for r in reflections] == [0, 1]
+    vf.process_reflection("u3", "c", True, "#333", now=datetime(2024, 1, 2, tzinfo=timezone.utc))
+    reflections = json.loads((tmp_path / "reflections.json").read_text())
+    assert reflections[-1]["id"] == 2
+
+
+def test_rollups_track_activity(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    base = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    text = "hope " * 31
+    vf.process_reflection("u1", text, True, "#111", now=base)
+    vf.process_reflection("u2", text, True, "#222", now=base + timedelta(minutes=10))
+    vf.process_reflection("u3", text, True, "#333", now=base + timedelta(minutes=70))
+    vf.process_reflection("u1", text, True, "#111", now=base + timedelta(minutes=70))
+    vf.evaluate_chain_rituals(now=base + timedelta(minutes=70))
+    vf.add_reaction(0, "👏", now=base + timedelta(days=1))
+    rollups = vf.load_rollups()
+    day = rollups["daily"]["2024-01-01"]
+    assert day["reflections"] == 4
+    assert vf.active_users(day) == 3
+    assert "users" not in day  # closed once 2024-01-02 started
+    assert day["xp_awarded"] == 85 * 3 + 60
+    assert "chain_rituals" not in day
+    assert rollups["hourly"]["2024-01-01T12"]["reflections"] == 2
+    assert rollups["hourly"]["2024-01-01T13"]["reflections"] == 2
+    assert rollups["daily"]["2024-01-02"]["reactions"] == 1
+
+
+def test_rollups_prune_old_hours(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    base = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    vf.record_activity(base, "u1", reflections=1)
+    vf.record_activity(base, "u2", reflections=1)
+    vf.record_activity(base + timedelta(days=8), "u1", reflections=1)
+    rollups = json.loads((tmp_path / "rollups.json").read_text())
+    assert list(rollups["hourly"]) == ["2024-01-09T12"]
+    assert rollups["daily"]["2024-01-01"] == {"reflections": 2, "active_users": 2}
+    assert rollups["daily"]["2024-01-09"]["users"] == ["u1"]
+
+
+def test_rollups_out_of_order_event_keeps_today_open(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    today = datetime(2024, 5, 2, 0, 30, tzinfo=timezone.utc)
+    vf.record_activity(today, "x", reflections=1)
+    vf.record_activity(today - timedelta(days=1), "y", reflections=1)
+    vf.record_activity(today + timedelta(hours=1), "z", reflections=1)
+    daily = vf.load_rollups()["daily"]
+    assert daily["2024-05-02"]["users"] == {"x", "z"}
+    assert daily["2024-05-02"]["reflections"] == 2
+    assert daily["2024-05-01"] == {"reflections": 1}
@@ -0,0 +1,240 @@
+import csv
+import io
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from vaultfire import app as vf
+from vaultfire import cli
+
+
+def setup_files(tmp_path, monkeypatch):
+    store = tmp_path / "store"
+    store.mkdir(parents=True)
+    for name, empty in [
+        ("users.json", "{}"),
+        ("reflections.json", "[]"),
+        ("rituals.json", "[]"),
+        ("reactions.json", "{}"),
+    ]:
+        (store / name).write_text(empty)
+    monkeypatch.setattr(vf, "USERS_FILE", store / "users.json")
+    monkeypatch.setattr(vf, "REFLECTIONS_FILE", store / "reflections.json")
+    monkeypatch.setattr(vf, "RITUALS_FILE", store / "rituals.json")
+    monkeypatch.setattr(vf, "REACTIONS_FILE", store / "reactions.json")
+    monkeypatch.setattr(vf, "ROLLUPS_FILE", store / "rollups.json")
+    return store
+
+
+def history():
+    base = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    rows = []
+    for day in range(8):
+        for i, user in enumerate(["u1", "u2", "u3"]):
+            rows.append(
+                {
+                    "user": user,
+                    "content": "hope " * (31 if day % 2 else 5),
+                    "timestamp": (base + timedelta(days=day, minutes=10 * i)).isoformat(),
+                    "public": user != "u2" or day > 3,
+                    "color": "#123456",
+                }
+            )
+    return rows
+
+
+def replay(rows):
+    """Feed ``rows`` through the dashboard's per-event path."""
+
+    for row in rows:
+        now = datetime.fromisoformat(row["timestamp"])
+        vf.process_reflection(row["user"], row["content"].strip(), row["public"], row["color"], now=now)
+        vf.evaluate_chain_rituals(now=now)
+
+
+def snapshot(store):
+    users = json.loads((store / "users.json").read_text())
+    for record in users.values():
+        record.pop("timestamp")
+        record.pop("rituals", None)
+    rituals = [r for r in json.loads((store / "rituals.json").read_text()) if "type" in r]
+    return (
+        users,
+        json.loads((store / "reflections.json").read_text()),
+        rituals,
+        json.loads((store / "rollups.json").read_text()),
+    )
+
+
+def test_import_matches_per_event_replay(tmp_path, monkeypatch):
+    rows = history()
+    store = setup_files(tmp_path / "a", monkeypatch)
+    replay(rows)
+    expected = snapshot(store)
+
+    store = setup_files(tmp_path / "b", monkeypatch)
+    source = tmp_path / "history.jsonl"
+    source.write_text("\n".join(json.dumps(r) for r in rows))
+    assert cli.main(["import", str(source), "--quiet"]) == 0
+    assert snapshot(store) == expected
+    users = json.loads((store / "users.json").read_text())
+    assert "Ritual of Fire" in users["u1"]["rituals"]
+    assert not list(store.glob("import_checkpoint*"))
+
+
+def test_import_csv_and_json_array(tmp_path, monkeypatch):
+    store = setup_files(tmp_path, monkeypatch)
+    rows = history()
+    source = tmp_path / "history.csv"
+    with source.open("w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows[:12])
+    assert cli.main(["import", str(source), "--quiet"]) == 0
+    source = tmp_path / "history.json"
+    source.write_text(json.dumps(rows[12:], indent=2))
+    assert cli.main(["import", str(source), "--quiet"]) == 0
+    reflections = json.loads((store / "reflections.json").read_text())
+    assert [r["id"] for r in reflections] == list(range(len(rows)))
+    assert reflections[0]["public"] is True
+    assert reflections[1]["public"] is False
+
+
+def test_import_migrates_legacy_reflections(tmp_path, monkeypatch):
+    store = setup_files(tmp_path, monkeypatch)
+    rows = history()
+    # the first half was already numbered, the rest predates reflection ids
+    legacy = [dict(row, id=i) if i < 3 else dict(row) for i, row in enumerate(rows[:6])]
+    (store / "reflections.json").write_text(json.dumps(legacy))
+    importer = cli.Importer(tmp_path / "history.jsonl", store / "import_checkpoint.json")
+    importer.start()
+    assert importer.next_id == 6
+    assert importer.counts == {"u1": 2, "u2": 2, "u3": 2}
+    importer.run(rows[6:])
+    reflections = json.loads((store / "reflections.json").read_text())
+    assert [r["id"] for r in reflections] == list(range(len(rows)))
+
+
+def test_import_normalizes_offsets_to_utc(tmp_path, monkeypatch):
+    store = setup_files(tmp_path, monkeypatch)
+    source = tmp_path / "history.jsonl"
+    source.write_text(
+        "\n".join(
+            json.dumps({"user": "u1", "content": "hope", "timestamp": ts})
+            for ts in ["2024-01-01T23:30:00-05:00", "2024-01-02T06:00:00+00:00"]
+        )
+    )
+    assert cli.main(["import", str(source), "--quiet"]) == 0
+    reflections = json.loads((store / "reflections.json").read_text())
+    assert [r["timestamp"] for r in reflections] == [
+        "2024-01-02T04:30:00+00:00",
+        "2024-01-02T06:00:00+00:00",
+    ]
+    assert [r["streak"] for r in reflections] == [1, 1]
+    user = json.loads((store / "users.json").read_text())["u1"]
+    assert user["reflection_dates"] == ["2024-01-02"]
+    assert user["xp"] == 10 + 25 + 10
+    assert list(json.loads((store / "rollups.json").read_text())["daily"]) == ["2024-01-02"]
+
+
+@pytest.mark.parametrize(
+    "name, bad",
+    [("history.jsonl", "[1, 2]"), ("history.jsonl", '{"user": "u2",'), ("history.json", '"x"')],
+)
+def test_import_reports_row_of_bad_input(tmp_path, monkeypatch, capsys, name, bad):
+    setup_files(tmp_path, monkeypatch)
+    good = json.dumps({"user": "u1", "content": "hope", "timestamp": "2024-01-01T12:00:00+00:00"})
+    source = tmp_path / name
+    if name.endswith(".jsonl"):
+        source.write_text(f"{good}\n\n{bad}\n{good}\n")
+    else:
+        source.write_text(f"[{good}, {bad}, {good}]")
+    assert cli.main(["import", str(source), "--quiet"]) == 1
+    assert "error: row 2:" in capsys.readouterr().err
+
+
+def test_iter_json_array_small_chunks():
+    items = [{"a": i, "s": "x]" * i} for i in range(20)] + [12345, "tail"]
+    fh = io.StringIO(json.dumps(items))
+    assert list(cli.iter_json_array(fh, chunk_size=3)) == items
+
+
+def test_iter_json_array_fails_fast_on_malformed_item():
+    good = json.dumps({"user": "u1", "content": "x" * 50})
+    fh = io.StringIO("[" + good + ', {"user": "u2" "content": 1}, ' + ", ".join([good] * 2000) + "]")
+    items = cli.iter_json_array(fh, chunk_size=256)
+    assert next(items)["user"] == "u1"
+    with pytest.raises(json.JSONDecodeError):
+        next(items)
+    assert fh.tell() <= 4 * 256  # did not buffer the rest of the file
+
+
+def test_import_resumes_from_checkpoint(tmp_path, monkeypatch):
+    store = setup_files(tmp_path, monkeypatch)
+    rows = history()
+    source = tmp_path / "history.jsonl"
+    source.write_text("\n".join(json.dumps(r) for r in rows))
+
+    def crash_after(limit):
+        for n, row in enumerate(rows, start=1):
+            if n > limit:
+                raise KeyboardInterrupt
+            yield row
+
+    importer = cli.Importer(source, store / "import_checkpoint.json")
+    importer.start()
+    with pytest.raises(KeyboardInterrupt):
+        importer.run(crash_after(15), every=5)
+    assert json.loads((store / "reflections.json").read_text()) == []
+
+    assert cli.main(["import", str(source), "--resume", "--quiet"]) == 0
+    reflections = json.loads((store / "reflections.json").read_text())
+    assert [r["id"] for r in reflections] == list(range(len(rows)))
+
+
+def test_resume_after_crash_while_swapping_stores(tmp_path, monkeypatch):
+    store = setup_files(tmp_path, monkeypatch)
+    rows = history()
+    source = tmp_path / "history.jsonl"
+    source.write_text("\n".join(json.dumps(r) for r in rows))
+    real_replace = os.replace
+
+    def crash_after_reflections(src, dst):
+        real_replace(src, dst)
+        if Path(dst) == vf.REFLECTIONS_FILE:
+            raise OSError("disk went away")
+
+    monkeypatch.setattr(cli.os, "replace", crash_after_reflections)
+    assert cli.main(["import", str(source), "--quiet"]) == 1
+    monkeypatch.setattr(cli.os, "replace", real_replace)
+    assert json.loads((store / "users.json").read_text()) == {}
+    assert cli.main(["import", str(source), "--quiet"]) == 1  # must resume, not restart
+
+    assert cli.main(["import", str(source), "--resume", "--quiet"]) == 0
+    reflections = json.loads((store / "reflections.json").read_text())
+    assert [r["id"] for r in reflections] == list(range(len(rows)))
+    assert set(json.loads((store / "users.json").read_text())) == {"u1", "u2", "u3"}
+    assert sorted(p.name for p in store.iterdir()) == [
+        "reactions.json", "reflections.json", "rituals.json", "rollups.json", "users.json"
+    ]
+
+
+def test_export_formats(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    replay(history()[:6])
+    out = io.StringIO()
+    assert cli.export_reflections(out, "jsonl", public_only=True) == 4
+    assert all(json.loads(line)["public"] for line in out.getvalue().splitlines())
+    dest = tmp_path / "out.json"
+    assert cli.main(["export", str(dest)]) == 0
+    assert [r["id"] for r in json.loads(dest.read_text())] == list(range(6))
+    out = io.StringIO()
+    cli.export_reflections(out, "csv")
+    assert len(list(csv.DictReader(io.StringIO(out.getvalue())))) == 6
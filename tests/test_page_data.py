@@ -0,0 +1,160 @@
+import contextlib
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from vaultfire import app as vf
+
+
+def setup_files(tmp_path, monkeypatch):
+    users = tmp_path / "users.json"
+    refs = tmp_path / "reflections.json"
+    rituals = tmp_path / "rituals.json"
+    reactions = tmp_path / "reactions.json"
+    users.write_text("{}")
+    refs.write_text("[]")
+    rituals.write_text("[]")
+    reactions.write_text("{}")
+    monkeypatch.setattr(vf, "USERS_FILE", users)
+    monkeypatch.setattr(vf, "REFLECTIONS_FILE", refs)
+    monkeypatch.setattr(vf, "RITUALS_FILE", rituals)
+    monkeypatch.setattr(vf, "REACTIONS_FILE", reactions)
+    monkeypatch.setattr(vf, "ROLLUPS_FILE", tmp_path / "rollups.json")
+
+
+class FakeStreamlit:
+    """Minimal stand-in for ``streamlit`` that records rendered calls."""
+
+    sidebar = contextlib.nullcontext()
+
+    def __init__(self, page, user="alice", pressed=()):
+        self.page = page
+        self.user = user
+        self.pressed = set(pressed)
+        self.session_state = {}
+        self.calls = []
+
+    def text_input(self, *args, **kwargs):
+        return self.user
+
+    def radio(self, label, options, **kwargs):
+        return self.page
+
+    def selectbox(self, label, options, **kwargs):
+        return options[0]
+
+    def color_picker(self, label, value, **kwargs):
+        return value
+
+    def text_area(self, *args, **kwargs):
+        return ""
+
+    def button(self, label, *args, **kwargs):
+        return label in self.pressed
+
+    def checkbox(self, *args, **kwargs):
+        return False
+
+    def columns(self, spec):
+        return [self] * (spec if isinstance(spec, int) else len(spec))
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args))
+
+        return record
+
+    def rendered(self, name):
+        return [args[0] for call, args in self.calls if call == name and args]
+
+
+def test_main_renders_dashboard(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    vf.process_reflection("alice", "hope", True, "#111", now=now)
+    vf.process_reflection("bob", "truth", True, "#222", now=now)
+    fake = FakeStreamlit("Dashboard")
+    monkeypatch.setattr(vf, "st", fake)
+    vf.main()
+    markdown = fake.rendered("markdown")
+    assert any("alice" in line and "XP" in line for line in markdown)
+    assert "_truth_" in markdown
+
+
+def test_user_record_does_not_load_reflections(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    vf.update_user_record("alice", 120)
+    calls = []
+    monkeypatch.setattr(vf, "load_reflections", lambda: calls.append(1) or [])
+    data = vf.PageData("alice")
+    assert data.user_record["xp"] == 120
+    assert calls == []
+
+
+def test_stores_loaded_once_per_rerun(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    vf.process_reflection("alice", "hope", True, "#111", now=now)
+    vf.process_reflection("bob", "truth", False, "#222", now=now)
+    calls = []
+    original = vf.load_reflections
+    monkeypatch.setattr(vf, "load_reflections", lambda: calls.append(1) or original())
+    data = vf.PageData("alice")
+    assert [r["user"] for r in data.user_reflections] == ["alice"]
+    assert [r["user"] for r in data.public_reflections] == ["alice"]
+    assert len(calls) == 1
+
+
+def test_signal_map_does_not_load_reflections(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(9):
+        vf.process_reflection("alice", f"note {i}", False, "#111", now=now)
+    calls = []
+    monkeypatch.setattr(vf, "load_reflections", lambda: calls.append(1) or [])
+    monkeypatch.setattr(vf, "render_signal_map", lambda record: None)
+    fake = FakeStreamlit("Signal Map")
+    monkeypatch.setattr(vf, "st", fake)
+    vf.main()
+    assert calls == []
+    assert [m for m in fake.rendered("markdown") if m.startswith("note")] == [
+        f"note {i}" for i in range(8, 1, -1)
+    ]
+
+
+def test_dashboard_loads_each_store_once(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    vf.process_reflection("alice", "hope", True, "#111", now=now)
+    vf.update_user_record("alice", 500, rituals=["Chainbreaker"])
+    loads = {"users": 0, "reflections": 0}
+    load_users, load_reflections = vf.load_users, vf.load_reflections
+
+    def counted(name, loader):
+        def wrapper():
+            loads[name] += 1
+            return loader()
+
+        return wrapper
+
+    monkeypatch.setattr(vf, "load_users", counted("users", load_users))
+    monkeypatch.setattr(vf, "load_reflections", counted("reflections", load_reflections))
+    monkeypatch.setattr(vf, "st", FakeStreamlit("Dashboard"))
+    vf.main()
+    # one read for the page and one read-modify-write for the final persist
+    assert loads == {"users": 2, "reflections": 1}
+
+
+def test_dashboard_bonus_xp_counted_in_rollups(tmp_path, monkeypatch):
+    setup_files(tmp_path, monkeypatch)
+    monkeypatch.setattr(vf, "SOUL_ARCHIVE", tmp_path / "soul_archive.json")
+    monkeypatch.setattr(vf, "utcnow", lambda: datetime(2024, 3, 1, 23, 59, tzinfo=timezone.utc))
+    vf.update_user_record("alice", 1200)
+    fake = FakeStreamlit("Dashboard", pressed={"Do Loyalty Action", "Claim Ghostkey Role"})
+    monkeypatch.setattr(vf, "st", fake)
+    vf.main()
+    day = vf.load_rollups()["daily"]["2024-03-01"]
+    assert day["xp_awarded"] == 300
@@ -0,0 +1,73 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from vaultfire import app as vf
+
+
+@pytest.fixture
+def restore_ranks():
+    original = list(vf.RANKS)
+    yield
+    vf.set_ranks(original)
+
+
+def test_rank_boundaries_and_open_top():
+    assert vf.get_rank(0) == ("Moral Novice", "🧠")
+    assert vf.get_rank(99) == ("Moral Novice", "🧠")
+    assert vf.get_rank(100) == ("Seeker", "🔎")
+    assert vf.get_rank(999)[0] == "Belief Architect"
+    assert vf.get_rank(25000)[0] == "Ghostkey Master"
+    assert vf.get_rank(-5) == ("Unknown", "❓")
+    rank, next_rank = vf.get_rank_info(150)
+    assert (rank["rank"], next_rank["rank"]) == ("Seeker", "Code Aligned")
+    assert vf.get_rank_info(25000)[1] is None
+    assert vf.progress_within_rank(150) == pytest.approx(50 / 99)
+    assert vf.progress_within_rank(25000) == 1.0
+
+
+def test_batch_matches_single_lookups():
+    xps = [25000, 1000, 700, 401, 150, 99, 0, -1]
+    assert vf.ranks_for(xps) == [vf.get_rank(xp) for xp in xps]
+    assert vf.progress_for(xps) == [vf.progress_within_rank(xp) for xp in xps]
+
+
+def test_rank_tiers_from_file(tmp_path, restore_ranks):
+    tiers = [
+        {"min_xp": 0, "max_xp": 499, "rank": "Sprout", "badge": "🌱"},
+        {"min_xp": 500, "max_xp": None, "rank": "Elder", "badge": "🌳"},
+    ]
+    path = tmp_path / "ranks.json"
+    path.write_text(json.dumps(tiers))
+    vf.load_rank_tiers(path)
+    assert [r["rank"] for r in vf.RANKS] == ["Sprout", "Elder"]
+    assert vf.ranks_for([10, 500, 90000]) == [("Sprout", "🌱"), ("Elder", "🌳"), ("Elder", "🌳")]
+    assert vf.progress_for([250, 90000]) == [pytest.approx(250 / 499), 1.0]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "[]",
+        '{"min_xp": 0}',
+        "not json",
+        '[{"max_xp": 10, "rank": "A", "badge": "a"}]',
+        '[{"min_xp": 0, "max_xp": 9, "rank": "A", "badge": "a"},'
+        ' {"min_xp": 20, "max_xp": null, "rank": "B", "badge": "b"}]',
+        '[{"min_xp": 10, "max_xp": null, "rank": "B", "badge": "b"},'
+        ' {"min_xp": 0, "max_xp": 9, "rank": "A", "badge": "a"}]',
+    ],
+)
+def test_invalid_rank_tiers_keep_defaults(tmp_path, restore_ranks, caplog, content):
+    path = tmp_path / "ranks.json"
+    path.write_text(content)
+    before = list(vf.RANKS)
+    vf.load_rank_tiers(path)
+    assert vf.RANKS == before
+    assert "Ignoring rank tiers" in caplog.text
+    assert vf.get_rank_info(150)[0]["rank"] == "Seeker"
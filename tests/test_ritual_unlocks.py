@@ -19,6 +19,7 @@ def setup_files(tmp_path, monkeypatch):
     monkeypatch.setattr(vf, "USERS_FILE", users_file)
     monkeypatch.setattr(vf, "REFLECTIONS_FILE", reflections_file)
     monkeypatch.setattr(vf, "RITUALS_FILE", rituals_file)
+    monkeypatch.setattr(vf, "ROLLUPS_FILE", tmp_path / "rollups.json")
     monkeypatch.setattr(vf, "VAULT_LOG", tmp_path / "vaultfire.log")
     return users_file, reflections_file, rituals_file
 
@@ -0,0 +1,5 @@
+"""Allow ``python -m vaultfire`` to run the command line tools."""
+
+from .cli import main
+
+raise SystemExit(main())
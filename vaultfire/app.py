@@ -13,7 +13,10 @@ bonus.
 
 from __future__ import annotations
 
+import logging
+from bisect import bisect_right
 from datetime import datetime, timedelta
+from functools import cached_property
 from pathlib import Path
 from typing import List, Dict
 from .utils import utcnow, read_json, write_json
@@ -32,6 +35,8 @@ except ModuleNotFoundError:  # pragma: no cover - used in tests
 
     st = _Stub()
 
+logger = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # Configuration
 
@@ -42,9 +47,12 @@ REFLECTIONS_FILE = ROOT / "reflections.json"
 RITUALS_FILE = ROOT / "rituals.json"
 VAULT_LOG = ROOT / "vaultfire.log"
 REACTIONS_FILE = ROOT / "reactions.json"
+ROLLUPS_FILE = ROOT / "rollups.json"
+RANKS_FILE = ROOT / "ranks.json"
 
 
-# Rank structure
+# Rank structure. A valid ``ranks.json`` file with the same shape replaces
+# these tiers at import time; the top tier is open ended.
 RANKS = [
     {"min_xp": 0, "max_xp": 99, "rank": "Moral Novice", "badge": "🧠"},
     {"min_xp": 100, "max_xp": 199, "rank": "Seeker", "badge": "🔎"},
@@ -68,33 +76,122 @@ def save_users(users: dict) -> None:
     write_json(USERS_FILE, users)
 
 
+# Sorted ``min_xp`` thresholds, rebuilt by ``set_ranks`` for bisect lookups.
+_RANK_FLOORS: List[int] = []
+
+
+def validate_rank_tiers(ranks) -> List[dict]:
+    """Return ``ranks`` if they form a usable tier table.
+
+    Tiers must be a non-empty list of dicts with an int ``min_xp`` and string
+    ``rank``/``badge``, sorted by ``min_xp`` with each ``max_xp`` ending just
+    before the next tier. The top tier's ``max_xp`` may be omitted or null.
+    Raises ``ValueError`` otherwise.
+    """
+
+    if not isinstance(ranks, list) or not ranks:
+        raise ValueError("rank tiers must be a non-empty list")
+    for tier in ranks:
+        if not isinstance(tier, dict) or type(tier.get("min_xp")) is not int:
+            raise ValueError(f"every tier needs an integer min_xp: {tier!r}")
+        if not isinstance(tier.get("rank"), str) or not isinstance(tier.get("badge"), str):
+            raise ValueError(f"every tier needs a rank and badge: {tier!r}")
+    for lower, upper in zip(ranks, ranks[1:]):
+        if lower.get("max_xp") != upper["min_xp"] - 1 or upper["min_xp"] <= lower["min_xp"]:
+            raise ValueError(f"tiers {lower['rank']!r} and {upper['rank']!r} are not sorted and contiguous")
+    top_max = ranks[-1].get("max_xp")
+    if top_max is not None and (type(top_max) is not int or top_max < ranks[-1]["min_xp"]):
+        raise ValueError(f"invalid max_xp for top tier {ranks[-1]['rank']!r}")
+    return ranks
+
+
+def set_ranks(ranks: List[dict]) -> None:
+    """Replace the rank tiers and recompile the threshold table.
+
+    Raises ``ValueError`` if ``ranks`` fails :func:`validate_rank_tiers`.
+    """
+
+    global RANKS, _RANK_FLOORS
+    RANKS = validate_rank_tiers(ranks)
+    _RANK_FLOORS = [r["min_xp"] for r in RANKS]
+
+
+def load_rank_tiers(path: Path) -> None:
+    """Load rank tiers from ``path`` if it exists.
+
+    An unreadable or invalid file is logged and the current tiers are kept.
+    """
+
+    if not path.exists():
+        set_ranks(RANKS)
+        return
+    try:
+        set_ranks(read_json(path, None))
+    except ValueError as exc:
+        logger.warning("Ignoring rank tiers in %s: %s", path, exc)
+        set_ranks(RANKS)
+
+
+def _rank_index(xp: int) -> int:
+    """Return the index of the tier containing ``xp``, or -1 below the first."""
+
+    return bisect_right(_RANK_FLOORS, xp) - 1
+
+
+def _progress(rank: dict, xp: int) -> float:
+    max_xp = rank.get("max_xp")
+    if max_xp is None:
+        return 1.0
+    span = max_xp - rank["min_xp"]
+    if span <= 0:
+        return 1.0
+    return min(1.0, max(0.0, (xp - rank["min_xp"]) / span))
+
+
 def get_rank(xp: int) -> tuple[str, str]:
     """Return the rank label and badge for a given XP amount."""
 
-    for rank in RANKS:
-        if rank["min_xp"] <= xp <= rank["max_xp"]:
-            return rank["rank"], rank["badge"]
-    return "Unknown", "❓"
+    i = _rank_index(xp)
+    if i < 0:
+        return "Unknown", "❓"
+    return RANKS[i]["rank"], RANKS[i]["badge"]
 
 
 def get_rank_info(xp: int):
     """Return the current rank structure and the next one if available."""
 
-    for i, r in enumerate(RANKS):
-        if r["min_xp"] <= xp <= r["max_xp"]:
-            next_rank = RANKS[i + 1] if i + 1 < len(RANKS) else None
-            return r, next_rank
-    return RANKS[-1], None
+    i = _rank_index(xp)
+    if i < 0:
+        return RANKS[-1], None
+    next_rank = RANKS[i + 1] if i + 1 < len(RANKS) else None
+    return RANKS[i], next_rank
 
 
 def progress_within_rank(xp: int) -> float:
     """Return progress (0..1) within the current rank."""
 
     r, _ = get_rank_info(xp)
-    span = r["max_xp"] - r["min_xp"]
-    if span == 0:
-        return 1.0
-    return (xp - r["min_xp"]) / span
+    return _progress(r, xp)
+
+
+def ranks_for(xps: List[int]) -> List[tuple[str, str]]:
+    """Return the rank label and badge for each XP amount in ``xps``."""
+
+    result = []
+    for xp in xps:
+        i = _rank_index(xp)
+        result.append(("Unknown", "❓") if i < 0 else (RANKS[i]["rank"], RANKS[i]["badge"]))
+    return result
+
+
+def progress_for(xps: List[int]) -> List[float]:
+    """Return ``progress_within_rank`` for each XP amount in ``xps``."""
+
+    # below the first tier the index is -1, which matches get_rank_info's fallback
+    return [_progress(RANKS[_rank_index(xp)], xp) for xp in xps]
+
+
+load_rank_tiers(RANKS_FILE)
 
 
 def update_user_record(user: str, xp: int, **updates) -> None:
@@ -152,24 +249,233 @@ def save_reflections(reflections: list) -> None:
     write_json(REFLECTIONS_FILE, reflections)
 
 
-def load_reactions() -> Dict[str, Dict[str, int]]:
-    """Load stored reactions keyed by reflection timestamp."""
+# ---------------------------------------------------------------------------
+# Reflection ids and the reaction index
+#
+# Reflections carry a compact, monotonically increasing ``id``. Reactions are
+# stored as ``{"by_id": {id: counts}, "totals": {id: n}, "ranking": [ids],
+# "positions": {id: index}}``. ``ranking`` is kept ordered by total reactions
+# so "most reacted" never needs a full sort, and ``positions`` locates an id
+# in it without a scan.
+
+REACTION_EMOJIS = ["👏", "🔥", "💭"]
+
+
+def _assign_reflection_ids(reflections: list) -> bool:
+    """Give reflections without an ``id`` the next free one, in order."""
 
-    return read_json(REACTIONS_FILE, {})
+    changed = False
+    next_id = 0
+    for ref in reflections:
+        if "id" not in ref:
+            ref["id"] = next_id
+            changed = True
+        next_id = ref["id"] + 1
+    return changed
 
 
-def save_reactions(reactions: Dict[str, Dict[str, int]]) -> None:
+def ensure_reflection_ids(reflections: list) -> list:
+    """Return ``reflections`` with ids, migrating legacy stores if needed."""
+
+    if reflections and "id" not in reflections[-1]:
+        return migrate_reflection_ids()
+    return reflections
+
+
+def _build_reaction_index(by_id: Dict[str, Dict[str, int]]) -> dict:
+    """Return a reaction index for ``by_id`` with totals and ranking rebuilt."""
+
+    totals = {key: sum(counts.values()) for key, counts in by_id.items()}
+    ranking = sorted((int(key) for key in by_id), key=lambda i: totals[str(i)], reverse=True)
+    positions = {str(ref_id): pos for pos, ref_id in enumerate(ranking)}
+    return {"by_id": by_id, "totals": totals, "ranking": ranking, "positions": positions}
+
+
+def migrate_reflection_ids() -> list:
+    """Assign ids to legacy reflections and re-key timestamp reactions.
+
+    Timestamp-keyed reactions are attached to the first reflection with that
+    timestamp. Returns the updated reflection list.
+    """
+
+    reflections = load_reflections()
+    if _assign_reflection_ids(reflections):
+        save_reflections(reflections)
+
+    raw = read_json(REACTIONS_FILE, {})
+    if "by_id" not in raw:
+        ids_by_timestamp: Dict[str, int] = {}
+        for ref in reflections:
+            ids_by_timestamp.setdefault(ref["timestamp"], ref["id"])
+        by_id = {
+            str(ids_by_timestamp[timestamp]): counts
+            for timestamp, counts in raw.items()
+            if timestamp in ids_by_timestamp
+        }
+        save_reactions(_build_reaction_index(by_id))
+    return reflections
+
+
+def load_reactions() -> dict:
+    """Load the reaction index, migrating timestamp-keyed stores."""
+
+    raw = read_json(REACTIONS_FILE, {})
+    if "by_id" in raw:
+        if "positions" not in raw:
+            return _build_reaction_index(raw["by_id"])  # stored before totals existed
+        return raw
+    if raw:
+        migrate_reflection_ids()
+        return read_json(REACTIONS_FILE, None) or _build_reaction_index({})
+    return _build_reaction_index({})
+
+
+def save_reactions(reactions: dict) -> None:
     write_json(REACTIONS_FILE, reactions)
 
 
-def add_reaction(ref_timestamp: str, emoji: str) -> None:
-    """Increment a reaction for the given reflection timestamp."""
+def get_reactions(ids: List[int], reactions: dict | None = None) -> Dict[int, Dict[str, int]]:
+    """Return reaction counts for each reflection id in ``ids``.
+
+    Pass an already loaded ``reactions`` index to avoid re-reading the file.
+    """
+
+    index = reactions if reactions is not None else load_reactions()
+    by_id = index["by_id"]
+    return {i: by_id.get(str(i), {}) for i in ids}
+
+
+def most_reacted(limit: int | None = None, reactions: dict | None = None) -> List[int]:
+    """Return reflection ids ordered by total reactions, highest first."""
+
+    index = reactions if reactions is not None else load_reactions()
+    ranking = index["ranking"]
+    return ranking[:limit] if limit is not None else list(ranking)
+
 
+def add_reaction(ref_id: int, emoji: str, now: datetime | None = None) -> None:
+    """Increment a reaction for the given reflection id."""
+
+    if emoji not in REACTION_EMOJIS:
+        return
     reactions = load_reactions()
-    entry = reactions.setdefault(ref_timestamp, {"👏": 0, "🔥": 0, "💭": 0})
-    if emoji in entry:
-        entry[emoji] += 1
+    key = str(ref_id)
+    entry = reactions["by_id"].setdefault(key, {e: 0 for e in REACTION_EMOJIS})
+    entry[emoji] += 1
+    totals, ranking, positions = reactions["totals"], reactions["ranking"], reactions["positions"]
+    total = totals[key] = totals.get(key, 0) + 1
+    if key not in positions:
+        positions[key] = len(ranking)
+        ranking.append(ref_id)
+
+    # Everything between the first lower total and this id had the old total,
+    # so one swap with the head of that run keeps the ranking sorted.
+    pos = target = positions[key]
+    while target > 0 and totals[str(ranking[target - 1])] < total:
+        target -= 1
+    if target != pos:
+        other = ranking[target]
+        ranking[target], ranking[pos] = ref_id, other
+        positions[key], positions[str(other)] = target, pos
+
     save_reactions(reactions)
+    record_activity(now or utcnow(), reactions=1)
+
+
+# ---------------------------------------------------------------------------
+# Activity rollups
+#
+# Counters are bumped as events happen so the stats page never has to scan
+# the full reflection, ritual or reaction history.
+
+ROLLUP_COUNTERS = ("reflections", "xp_awarded", "chain_rituals", "reactions")
+
+
+# Hourly buckets older than this are dropped; daily buckets are kept.
+HOURLY_RETENTION = timedelta(days=7)
+
+
+def rollups_from_json(data: dict) -> dict:
+    """Turn stored rollups into their in-memory form (user lists to sets)."""
+
+    for bucket in data.setdefault("daily", {}).values():
+        if "users" in bucket:
+            bucket["users"] = set(bucket["users"])
+    data.setdefault("hourly", {})
+    return data
+
+
+def rollups_to_json(rollups: dict) -> dict:
+    """Return a JSON-serialisable copy of in-memory rollups."""
+
+    daily = {
+        day: {**bucket, "users": sorted(bucket["users"])} if "users" in bucket else bucket
+        for day, bucket in rollups.get("daily", {}).items()
+    }
+    return {"daily": daily, "hourly": rollups.get("hourly", {})}
+
+
+def load_rollups() -> dict:
+    """Return the per-day and per-hour activity counters."""
+
+    return rollups_from_json(read_json(ROLLUPS_FILE, {"daily": {}, "hourly": {}}))
+
+
+def save_rollups(rollups: dict) -> None:
+    write_json(ROLLUPS_FILE, rollups_to_json(rollups), compact=True)
+
+
+def active_users(bucket: dict) -> int:
+    """Return the number of distinct users active in a daily bucket."""
+
+    return bucket.get("active_users", len(bucket.get("users", ())))
+
+
+def bump_rollups(rollups: dict, now: datetime, user: str | None = None, **counts: int) -> None:
+    """Add ``counts`` to the day and hour buckets containing ``now``.
+
+    The current day tracks its distinct users as a set. When a new day
+    starts, earlier days keep only their ``active_users`` count and hourly
+    buckets older than ``HOURLY_RETENTION`` are dropped, so the rollups stay
+    small however long the history grows. Events for a day older than one
+    already recorded only update that day's counters.
+    """
+
+    daily = rollups.setdefault("daily", {})
+    hourly = rollups.setdefault("hourly", {})
+    day_key = now.date().isoformat()
+    hour_key = now.strftime("%Y-%m-%dT%H")
+
+    if day_key not in daily:
+        later_day = False
+        for key, bucket in daily.items():
+            if key > day_key:
+                later_day = True
+            elif "users" in bucket:
+                bucket["active_users"] = len(bucket.pop("users"))
+        # an event older than an existing day only gets counters
+        daily[day_key] = {} if later_day else {"users": set()}
+    if hour_key not in hourly:
+        cutoff = (now - HOURLY_RETENTION).strftime("%Y-%m-%dT%H")
+        for key in [k for k in hourly if k < cutoff]:
+            del hourly[key]
+        hourly[hour_key] = {}
+
+    day, hour = daily[day_key], hourly[hour_key]
+    for name, amount in counts.items():
+        day[name] = day.get(name, 0) + amount
+        hour[name] = hour.get(name, 0) + amount
+    # late events for an already closed day only update its counters
+    if user is not None and "users" in day:
+        day["users"].add(user)
+
+
+def record_activity(now: datetime, user: str | None = None, **counts: int) -> None:
+    """Persist an activity event into ``rollups.json``."""
+
+    rollups = load_rollups()
+    bump_rollups(rollups, now, user, **counts)
+    save_rollups(rollups)
 
 
 KEYWORDS = {"hope", "sacrifice", "truth", "trust"}
@@ -181,14 +487,12 @@ RITUAL_MEANINGS = {
 }
 
 
-def process_reflection(user: str, content: str, public: bool, color: str, now: datetime | None = None):
-    """Record a reflection and update XP/streak information.
+def score_reflection(record: dict, content: str, now: datetime) -> tuple[int, dict]:
+    """Return the XP gained from a reflection and the user fields it updates.
 
-    Returns the user's new XP total and the XP gained from this reflection.
+    ``record`` is the user's stored record and is not modified.
     """
 
-    # `now` is injected for tests; default to an aware UTC timestamp
-    now = now or utcnow()
     # XP is awarded for sufficiently long reflections and for using
     # certain keywords that indicate depth of thought.
     word_count = len(content.split())
@@ -196,10 +500,6 @@ def process_reflection(user: str, content: str, public: bool, color: str, now: d
     keyword_gain = 10 if any(k in content.lower() for k in KEYWORDS) else 0
     xp_gain = base_gain + keyword_gain
 
-    users = load_users()
-    record = users.get(user, {})
-    xp = record.get("xp", 0)
-
     today = now.date()
     last_date_str = record.get("last_reflection_date")
     streak = record.get("streak", 0)
@@ -218,64 +518,102 @@ def process_reflection(user: str, content: str, public: bool, color: str, now: d
         streak = 1
         streak_bonus = 25  # first ever reflection
 
-    dates = record.get("reflection_dates", [])
+    dates = list(record.get("reflection_dates", []))
     today_iso = today.isoformat()
     if today_iso not in dates:
         dates.append(today_iso)
 
-    badges = record.get("badges", [])
+    badges = list(record.get("badges", []))
     if streak >= 7 and "7-Day Streak" not in badges:
         badges.append("7-Day Streak")
     if streak >= 30 and "30-Day Streak" not in badges:
         badges.append("30-Day Streak")
 
-    total_gain = xp_gain + streak_bonus
-    xp += total_gain
+    updates = {
+        "streak": streak,
+        "last_reflection_date": today_iso,
+        "reflection_dates": dates,
+        "badges": badges,
+    }
+    return xp_gain + streak_bonus, updates
 
-    reflections = load_reflections()
-    reflections.append(
-        {
-            "user": user,
-            "timestamp": now.isoformat(),
-            "content": content,
-            "public": public,
-            "color": color,
-            "xp_gain": total_gain,
-            "streak": streak,
-        }
-    )
+
+RECENT_REFLECTIONS = 7
+
+
+def recent_reflections(record: dict, entry: dict) -> list:
+    """Return the user's recent reflections with ``entry`` added, newest last.
+
+    The sidebar shows these straight from the user record so it never has
+    to read the full reflection history.
+    """
+
+    recent = list(record.get("recent_reflections", []))
+    recent.append({key: entry[key] for key in ("timestamp", "content", "color")})
+    return recent[-RECENT_REFLECTIONS:]
+
+
+def process_reflection(user: str, content: str, public: bool, color: str, now: datetime | None = None):
+    """Record a reflection and update XP/streak information.
+
+    Returns the user's new XP total and the XP gained from this reflection.
+    """
+
+    # `now` is injected for tests; default to an aware UTC timestamp
+    now = now or utcnow()
+
+    record = load_users().get(user, {})
+    total_gain, updates = score_reflection(record, content, now)
+    xp = record.get("xp", 0) + total_gain
+
+    reflections = ensure_reflection_ids(load_reflections())
+    entry = {
+        "id": reflections[-1]["id"] + 1 if reflections else 0,
+        "user": user,
+        "timestamp": now.isoformat(),
+        "content": content,
+        "public": public,
+        "color": color,
+        "xp_gain": total_gain,
+        "streak": updates["streak"],
+    }
+    reflections.append(entry)
     save_reflections(reflections)
+    updates["recent_reflections"] = recent_reflections(record, entry)
+    record_activity(now, user, reflections=1, xp_awarded=total_gain)
 
-    update_user_record(
-        user,
-        xp,
-        streak=streak,
-        last_reflection_date=today_iso,
-        reflection_dates=dates,
-        badges=badges,
-    )
+    update_user_record(user, xp, **updates)
     return xp, total_gain
 
 
-def evaluate_chain_rituals(now: datetime | None = None) -> List[str]:
-    """Check for a chain ritual and award participants.
+# Chain ritual rules: three users posting publicly within CHAIN_WINDOW earn
+# CHAIN_XP each; three chains within CHAIN_TITLE_WINDOW grant a title.
+CHAIN_WINDOW = timedelta(minutes=30)
+CHAIN_TITLE_WINDOW = timedelta(days=7)
+CHAIN_MIN_PARTICIPANTS = 3
+CHAIN_XP = 150
 
-    Returns the list of participants if a ritual was triggered.
+
+def find_chain_participants(reflections, rituals, now: datetime) -> List[str]:
+    """Return the participants of a new chain ritual at ``now``.
+
+    ``reflections`` and ``rituals`` may be any iterables of stored entries;
+    only public reflections inside the 30 minute window count. Returns an
+    empty list when fewer than three users took part or the same group was
+    already rewarded within the window.
     """
 
-    # Use an aware timestamp to avoid naive/aware warnings
-    now = now or utcnow()
-    window_start = now - timedelta(minutes=30)
-    reflections = [
-        r
-        for r in load_reflections()
-        if r.get("public") and datetime.fromisoformat(r["timestamp"]) >= window_start
-    ]
-    participants = sorted({r["user"] for r in reflections})
-    if len(participants) < 3:
+    window_start = now - CHAIN_WINDOW
+    participants = sorted(
+        {
+            r["user"]
+            for r in reflections
+            if r.get("public") and datetime.fromisoformat(r["timestamp"]) >= window_start
+        }
+    )
+    if len(participants) < CHAIN_MIN_PARTICIPANTS:
         return []
 
-    rituals = load_rituals()
     for event in rituals:
         if event.get("type") == "ChainRitual":
             event_time = datetime.fromisoformat(event["timestamp"])
@@ -284,6 +622,49 @@ def evaluate_chain_rituals(now: datetime | None = None) -> List[str]:
                 participants
             ):
                 return []
+    return participants
+
+
+def recent_chain_count(rituals, participant: str, now: datetime) -> int:
+    """Return how many chain rituals ``participant`` joined in the title window."""
+
+    week_start = now - CHAIN_TITLE_WINDOW
+    return sum(
+        1
+        for e in rituals
+        if e.get("type") == "ChainRitual"
+        and participant in e.get("participants", [])
+        and datetime.fromisoformat(e["timestamp"]) >= week_start
+    )
+
+
+def chain_award(record: dict, recent_chains: int) -> tuple[int, dict]:
+    """Return the new XP and record fields for a chain ritual participant.
+
+    ``recent_chains`` counts the participant's chains within the title window,
+    including the one being rewarded.
+    """
+
+    xp = record.get("xp", 0) + CHAIN_XP
+    chain_count = record.get("chain_rituals", 0) + 1
+    title = record.get("title")
+    if recent_chains >= 3:
+        title = "Signal Architect"  # title after three chains in a week
+    return xp, {"chain_rituals": chain_count, "title": title}
+
+
+def evaluate_chain_rituals(now: datetime | None = None) -> List[str]:
+    """Check for a chain ritual and award participants.
+
+    Returns the list of participants if a ritual was triggered.
+    """
+
+    # Use an aware timestamp to avoid naive/aware warnings
+    now = now or utcnow()
+    rituals = load_rituals()
+    participants = find_chain_participants(load_reflections(), rituals, now)
+    if not participants:
+        return []
 
     rituals.append(
         {
@@ -293,24 +674,12 @@ def evaluate_chain_rituals(now: datetime | None = None) -> List[str]:
         }
     )
     write_json(RITUALS_FILE, rituals)
+    record_activity(now, chain_rituals=1, xp_awarded=CHAIN_XP * len(participants))
 
     users = load_users()
     for p in participants:
-        record = users.get(p, {})
-        xp = record.get("xp", 0) + 150
-        chain_count = record.get("chain_rituals", 0) + 1
-        week_start = now - timedelta(days=7)
-        recent_events = [
-            e
-            for e in rituals
-            if e.get("type") == "ChainRitual"
-            and p in e.get("participants", [])
-            and datetime.fromisoformat(e["timestamp"]) >= week_start
-        ]
-        title = record.get("title")
-        if len(recent_events) >= 3:
-            title = "Signal Architect"  # title after three chains in a week
-        update_user_record(p, xp, chain_rituals=chain_count, title=title)
+        xp, updates = chain_award(users.get(p, {}), recent_chain_count(rituals, p, now))
+        update_user_record(p, xp, **updates)
     return participants
 
 
@@ -402,13 +771,101 @@ def render_signal_map(record: dict) -> None:
             g.edge("Ghostkey Master", ritual)
 
     st.graphviz_chart(g)
+
+
+def render_stats(rollups: dict) -> None:
+    """Display activity over time from the precomputed rollups."""
+
+    daily = rollups.get("daily", {})
+    if not daily:
+        st.info("No activity recorded yet.")
+        return
+
+    rows = [
+        {
+            "day": day,
+            "active_users": active_users(bucket),
+            **{name: bucket.get(name, 0) for name in ROLLUP_COUNTERS},
+        }
+        for day, bucket in sorted(daily.items())
+    ]
+    latest = rows[-1]
+    st.subheader(f"Latest day: {latest['day']}")
+    cols = st.columns(5)
+    labels = ["Reflections", "Active users", "XP awarded", "Chain rituals", "Reactions"]
+    keys = ["reflections", "active_users", "xp_awarded", "chain_rituals", "reactions"]
+    for col, label, key in zip(cols, labels, keys):
+        col.metric(label, latest[key])
+
+    st.subheader("Daily activity")
+    st.line_chart(rows, x="day", y=["reflections", "active_users", "chain_rituals", "reactions"])
+    st.bar_chart(rows, x="day", y="xp_awarded")
+    st.dataframe(rows)
+
+    hourly = sorted(rollups.get("hourly", {}).items())[-24:]
+    if hourly:
+        st.subheader("Last 24 active hours")
+        st.bar_chart(
+            [{"hour": hour, **{name: b.get(name, 0) for name in ROLLUP_COUNTERS}} for hour, b in hourly],
+            x="hour",
+            y=["reflections", "reactions"],
+        )
+
+
+class PageData:
+    """Lazy, per-rerun view of the persisted stores.
+
+    Each store is read from disk the first time a page touches it and then
+    reused for the rest of the rerun, so a page only pays for the data it
+    actually displays.
+    """
+
+    def __init__(self, user_id: str) -> None:
+        self.user_id = user_id
+
+    @cached_property
+    def users(self) -> dict:
+        return load_users()
+
+    @cached_property
+    def user_record(self) -> dict:
+        return self.users.get(self.user_id, {"xp": 0})
+
+    @cached_property
+    def reflections(self) -> list:
+        return ensure_reflection_ids(load_reflections())
+
+    @cached_property
+    def user_reflections(self) -> list:
+        return [r for r in self.reflections if r["user"] == self.user_id]
+
+    @cached_property
+    def recent_reflections(self) -> list:
+        record = self.user_record
+        if "recent_reflections" in record or not record.get("reflection_dates"):
+            return record.get("recent_reflections", [])
+        # records written before the summary existed fall back to the history
+        return self.user_reflections[-RECENT_REFLECTIONS:]
+
+    @cached_property
+    def public_reflections(self) -> list:
+        return [r for r in self.reflections if r.get("public")]
+
+    @cached_property
+    def reactions(self) -> dict:
+        return load_reactions()
+
+    @cached_property
+    def rollups(self) -> dict:
+        return load_rollups()
+
+
 def main() -> None:
     """Run the Streamlit interface."""
 
     # ---------------------------------------------------------------------------
     # Identity input
 
-    users = load_users()
     user_input = st.text_input(
         "Enter your identity (name, ENS, or wallet alias)",
         st.session_state.get("user_id", ""),
@@ -421,9 +878,10 @@ def main() -> None:
 
     user_id = user_input.strip()
     st.session_state["user_id"] = user_id
+    data = PageData(user_id)
 
     # Load or initialize XP for this user
-    user_record = users.get(user_id, {"xp": 0})
+    user_record = data.user_record
     if st.session_state.get("xp_user") != user_id:
         st.session_state["xp"] = user_record.get("xp", 0)
         st.session_state["xp_user"] = user_id
@@ -437,7 +895,7 @@ def main() -> None:
     rank_label, badge = rank_struct["rank"], rank_struct["badge"]
 
     with st.sidebar:
-        page = st.radio("Page", ["Dashboard", "Signal Map", "Signalboard"])
+        page = st.radio("Page", ["Dashboard", "Signal Map", "Signalboard", "Stats"])
         st.header("Your Status")
         st.markdown(f"{badge} **{rank_label}**")
         st.markdown(f"XP: `{xp}`")
@@ -457,8 +915,7 @@ def main() -> None:
                 st.markdown(f"<span title='{meaning}'>{r}</span>", unsafe_allow_html=True)
 
         st.subheader("Recent Reflections")
-        recent_refs = [r for r in load_reflections() if r["user"] == user_id][-7:]
-        for ref in reversed(recent_refs):
+        for ref in reversed(data.recent_reflections):
             st.caption(ref["timestamp"])
             st.markdown(ref["content"])
             st.markdown(
@@ -499,6 +956,7 @@ def main() -> None:
             xp += 50
             st.session_state["xp"] = xp
             update_user_record(user_id, xp)
+            record_activity(utcnow(), user_id, xp_awarded=50)
             st.experimental_rerun()
 
         # Claim Ghostkey Role if master
@@ -511,6 +969,7 @@ def main() -> None:
                     st.session_state["xp"] = xp
                     st.session_state["claimed_master"] = True
                     update_user_record(user_id, xp)
+                    record_activity(utcnow(), user_id, xp_awarded=250)
                     st.markdown(
                         "<span style='font-size:40px'>✨👻✨</span>", unsafe_allow_html=True
                     )
@@ -520,32 +979,38 @@ def main() -> None:
         # Leaderboard
 
         st.header("🏆 Leaderboard")
-        users = load_users()
         sorted_users = sorted(
-            users.items(), key=lambda item: item[1].get("xp", 0), reverse=True
+            data.users.items(), key=lambda item: item[1].get("xp", 0), reverse=True
         )
+        xps = [record.get("xp", 0) for _, record in sorted_users]
 
-        for position, (uid, data) in enumerate(sorted_users, start=1):
-            u_rank, u_badge = get_rank(data.get("xp", 0))
+        for position, ((uid, record), (u_rank, u_badge), progress) in enumerate(
+            zip(sorted_users, ranks_for(xps), progress_for(xps)), start=1
+        ):
             line = f"**{position}. {u_badge} {uid}**"
-            if data.get("title"):
-                line += f" ({data['title']})"
-            if data.get("chain_rituals", 0) >= 2:
+            if record.get("title"):
+                line += f" ({record['title']})"
+            if record.get("chain_rituals", 0) >= 2:
                 line += " 🔥 Chain Ritualist"
-            line += f" - {data.get('xp', 0)} XP"
+            line += f" - {record.get('xp', 0)} XP"
             st.markdown(line)
-            st.progress(progress_within_rank(data.get("xp", 0)))
-            if uid == user_id and position <= 3:
+            st.progress(progress)
+            # the unlock check re-reads the stores, so skip it once earned
+            if (
+                uid == user_id
+                and position <= 3
+                and "Chainbreaker" not in data.user_record.get("rituals", [])
+            ):
                 check_and_unlock_rituals(user_id, top3=True)
 
         st.subheader("Public Signals")
-        public_refs = [r for r in load_reflections() if r.get("public")]
-        reactions = load_reactions()
-        for ref in reversed(public_refs[-10:]):
+        shown = list(reversed(data.public_reflections[-10:]))
+        reactions = get_reactions([r["id"] for r in shown], data.reactions)
+        for ref in shown:
             st.markdown(f"_{ref['content']}_")
-            counts = reactions.get(ref["timestamp"], {})
+            counts = reactions[ref["id"]]
             bubble = " ".join(
-                f"{e} {counts.get(e,0)}" for e in ["👏", "🔥", "💭"] if counts.get(e, 0)
+                f"{e} {counts.get(e,0)}" for e in REACTION_EMOJIS if counts.get(e, 0)
             )
             st.caption(f"{ref['timestamp']} {bubble}".strip())
             st.markdown(
@@ -556,43 +1021,48 @@ def main() -> None:
     elif page == "Signal Map":
         st.title("🌐 Signal Map")
         render_signal_map(user_record)
+    elif page == "Stats":
+        st.title("📊 Activity Stats")
+        render_stats(data.rollups)
     else:
         st.title("📡 Signalboard")
-        public_refs = [r for r in load_reflections() if r.get("public")]
-        sort_by = st.selectbox("Sort by", ["Newest", "Highest XP", "Streak Position"])
+        public_refs = list(data.public_reflections)
+        sort_by = st.selectbox(
+            "Sort by", ["Newest", "Highest XP", "Streak Position", "Most Reacted"]
+        )
         if sort_by == "Newest":
             public_refs.sort(key=lambda r: r["timestamp"], reverse=True)
         elif sort_by == "Highest XP":
             public_refs.sort(key=lambda r: r.get("xp_gain", 0), reverse=True)
-        else:
+        elif sort_by == "Streak Position":
             public_refs.sort(key=lambda r: r.get("streak", 0), reverse=True)
-
-        reactions = load_reactions()
-        users_data = load_users()
-        for ref in public_refs:
-            badge = get_rank(users_data.get(ref["user"], {}).get("xp", 0))[1]
+        else:
+            # reacted reflections in ranking order, then the rest newest first
+            by_id = {r["id"]: r for r in public_refs}
+            ranked = [by_id.pop(i) for i in most_reacted(reactions=data.reactions) if i in by_id]
+            public_refs = ranked + sorted(by_id.values(), key=lambda r: r["id"], reverse=True)
+
+        reactions = get_reactions([r["id"] for r in public_refs], data.reactions)
+        users_data = data.users
+        badges = ranks_for([users_data.get(r["user"], {}).get("xp", 0) for r in public_refs])
+        for ref, (_, badge) in zip(public_refs, badges):
             st.markdown(f"{badge} _{ref['content']}_")
             st.caption(f"{ref['timestamp']} · +{ref.get('xp_gain',0)} XP")
             st.markdown(
                 f"<div style='background-color:{ref.get('color', '#ccc')};height:5px;'></div>",
                 unsafe_allow_html=True,
             )
-            counts = reactions.get(ref["timestamp"], {})
+            counts = reactions[ref["id"]]
             cols = st.columns(3)
-            for emoji, col in zip(["👏", "🔥", "💭"], cols):
+            for emoji, col in zip(REACTION_EMOJIS, cols):
                 label = f"{emoji} {counts.get(emoji,0)}"
-                if col.button(label, key=f"{emoji}-{ref['timestamp']}"):
-                    add_reaction(ref["timestamp"], emoji)
+                if col.button(label, key=f"{emoji}-{ref['id']}"):
+                    add_reaction(ref["id"], emoji)
                     st.experimental_rerun()
 
-    # Ensure current user's data is persisted
-    latest = load_users().get(user_id, {})
-    update_user_record(
-        user_id,
-        xp,
-        rituals=latest.get("rituals", []),
-        vault_revealed=latest.get("vault_revealed", False),
-    )
+    # Ensure current user's data is persisted; ``update_user_record`` merges
+    # into the stored record so rituals unlocked during this rerun survive.
+    update_user_record(user_id, xp)
 
 
 if __name__ == "__main__":
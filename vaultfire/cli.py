@@ -0,0 +1,581 @@
+"""Command line tools for bulk Vaultfire history.
+
+``python -m vaultfire import history.jsonl`` replays reflections from a JSON
+array, JSONL or CSV file. Rows are parsed one at a time, XP, streaks, chain
+rituals and ritual unlocks are computed in memory, and every store is written
+once at the end. Imported reflections are staged on disk and a checkpoint is
+saved periodically, so an interrupted import can continue with ``--resume``.
+
+``python -m vaultfire export out.csv`` streams the stored reflections back out.
+
+Input rows need ``user``, ``content`` and an ISO ``timestamp``; ``public`` and
+``color`` are optional. Rows must be in chronological order and must not
+predate the reflections already stored.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from collections import Counter, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Callable, Iterable, Iterator
+
+from . import app
+from .utils import utcnow, read_json, write_json
+
+FORMATS = ("json", "jsonl", "csv")
+# longest token a chunk boundary can split, e.g. a "\uXXXX\uXXXX" escape pair
+_TRUNCATION_SLACK = 16
+EXPORT_FIELDS = ["id", "user", "timestamp", "content", "public", "color", "xp_gain", "streak"]
+
+
+# ---------------------------------------------------------------------------
+# Streaming readers
+
+def detect_format(path: str, fmt: str | None = None) -> str:
+    """Return ``fmt`` or guess the format from the file suffix."""
+
+    if fmt:
+        return fmt
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".csv":
+        return "csv"
+    return "json"
+
+
+def iter_json_array(fh: IO[str], chunk_size: int = 1 << 16) -> Iterator:
+    """Yield the items of a top level JSON array without loading it whole."""
+
+    decoder = json.JSONDecoder()
+    buf, pos, eof, opened = "", 0, False, False
+
+    def fill() -> None:
+        nonlocal buf, pos, eof
+        chunk = fh.read(chunk_size)
+        eof = not chunk
+        buf, pos = buf[pos:] + chunk, 0
+
+    while True:
+        while pos < len(buf) and (buf[pos].isspace() or (opened and buf[pos] == ",")):
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                if not opened:
+                    return  # empty file
+                raise ValueError("unexpected end of JSON array")
+            fill()
+            continue
+        if not opened:
+            if buf[pos] != "[":
+                raise ValueError("expected a JSON array")
+            opened = True
+            pos += 1
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError as exc:
+            # A cut-off item fails within a few characters of the buffer end
+            # (or at the start of an unterminated string); anything earlier is
+            # malformed input, so fail now instead of buffering the rest.
+            cut_off = exc.pos >= len(buf) - _TRUNCATION_SLACK or exc.msg.startswith("Unterminated string")
+            if eof or not cut_off:
+                raise
+            fill()  # the item continues in the next chunk
+            continue
+        if end == len(buf) and not eof:
+            fill()  # a trailing scalar may have been cut short
+            continue
+        pos = end
+        yield item
+
+
+def iter_rows(fh: IO[str], fmt: str) -> Iterator[dict]:
+    """Yield input rows from ``fh`` in the given format."""
+
+    if fmt == "jsonl":
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == "csv":
+        yield from csv.DictReader(fh)
+    else:
+        yield from iter_json_array(fh)
+
+
+def iter_stored(path: Path) -> Iterator[dict]:
+    """Stream the entries of a stored JSON list such as ``rituals.json``."""
+
+    if not path.exists():
+        return
+    with path.open(encoding="utf-8") as fh:
+        yield from iter_json_array(fh)
+
+
+def iter_stored_reflections() -> Iterator[dict]:
+    """Stream the reflections currently stored in ``reflections.json``."""
+
+    return iter_stored(app.REFLECTIONS_FILE)
+
+
+def _field(row: dict, name: str) -> str:
+    value = row.get(name)
+    if value is None or value == "":
+        raise ValueError(f"missing {name!r}")
+    return str(value)
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+
+def _parse_time(value: str) -> datetime:
+    ts = datetime.fromisoformat(value)
+    # naive timestamps are taken to be UTC; everything is stored in UTC like
+    # the rest of the app so streak days and rollup buckets line up
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Import
+
+class Importer:
+    """Replay historical reflections in memory and write each store once.
+
+    Memory is bounded by the number of users, not by reflections or rituals:
+    new reflections and rituals go to staging files next to ``checkpoint`` and
+    are merged into the stores by streaming when the import finishes. Chain
+    rituals are detected from small rolling indexes instead of scanning the
+    ritual history.
+    """
+
+    def __init__(self, source: Path, checkpoint: Path) -> None:
+        self.source = str(Path(source).resolve())
+        self.checkpoint = checkpoint
+        self.staging = checkpoint.with_suffix(".staging.jsonl")
+        self.ritual_staging = checkpoint.with_suffix(".rituals.jsonl")
+        self.rows = 0
+        self.stamp = utcnow().isoformat()
+        self.next_id = 0
+        self.last_time: datetime | None = None
+        self.users: dict = {}
+        self.rollups: dict = {}
+        self.counts: dict = {}
+        # public posters inside the chain window, with per-user multiplicity
+        self.window: deque = deque()
+        self.window_users: Counter = Counter()
+        # chain rituals inside the chain window, for duplicate checks
+        self.recent_chains: deque = deque()
+        # each user's chain times inside the title window
+        self.user_chains: dict = {}
+        self._staged: IO[bytes] | None = None
+        self._staged_rituals: IO[bytes] | None = None
+        self.finishing = False
+
+    # -- setup ---------------------------------------------------------------
+
+    def start(self) -> None:
+        """Begin a fresh import from the current stores."""
+
+        # number legacy reflections and re-key their reactions before scanning
+        with contextlib.closing(iter_stored_reflections()) as stored:
+            if any("id" not in ref for ref in stored):
+                app.migrate_reflection_ids()
+        app.load_reactions()  # migrates timestamp-keyed reactions up front
+
+        self.users = app.load_users()
+        self.rollups = app.load_rollups()
+        self.next_id = 0
+        self.last_time = None
+        self.counts = {}
+        self.window, self.window_users = deque(), Counter()
+        self.recent_chains, self.user_chains = deque(), {}
+
+        for ref in iter_stored_reflections():
+            now = datetime.fromisoformat(ref["timestamp"])
+            self.next_id = ref["id"] + 1
+            self.counts[ref["user"]] = self.counts.get(ref["user"], 0) + 1
+            self.last_time = now
+            if ref.get("public"):
+                self._enter_window(now, ref["user"])
+            self._trim(now)
+        for event in iter_stored(app.RITUALS_FILE):
+            if event.get("type") == "ChainRitual":
+                self._index_chain(datetime.fromisoformat(event["timestamp"]), event["participants"])
+        if self.last_time:
+            self._trim(self.last_time)
+
+        for dest in _store_files():
+            _pending(dest).unlink(missing_ok=True)
+        self._staged = self.staging.open("wb")
+        self._staged_rituals = self.ritual_staging.open("wb")
+
+    def resume(self) -> None:
+        """Restore the state saved by :meth:`save_checkpoint`."""
+
+        state = read_json(self.checkpoint, None)
+        if state is None:
+            raise ValueError(f"no checkpoint at {self.checkpoint}")
+        if state["source"] != self.source:
+            raise ValueError(f"checkpoint belongs to {state['source']}")
+        if state.get("finishing"):
+            # every store was already written; only the swap is left
+            self.rows, self.finishing = state["rows"], True
+            return
+        for name in ("rows", "stamp", "next_id", "users", "counts"):
+            setattr(self, name, state[name])
+        self.last_time = _parse_time(state["last_time"]) if state["last_time"] else None
+        self.rollups = app.rollups_from_json(state["rollups"])
+        self.window, self.window_users = deque(), Counter()
+        for ts, user in state["window"]:
+            self._enter_window(datetime.fromisoformat(ts), user)
+        self.recent_chains = deque(
+            (datetime.fromisoformat(ts), frozenset(group)) for ts, group in state["recent_chains"]
+        )
+        self.user_chains = {
+            user: deque(datetime.fromisoformat(ts) for ts in times)
+            for user, times in state["user_chains"].items()
+        }
+        # drop entries staged after the checkpoint; those rows are replayed
+        for path, size in ((self.staging, state["staged_bytes"]), (self.ritual_staging, state["staged_ritual_bytes"])):
+            with path.open("r+b") as fh:
+                fh.truncate(size)
+        self._staged = self.staging.open("ab")
+        self._staged_rituals = self.ritual_staging.open("ab")
+
+    def save_checkpoint(self) -> None:
+        """Flush staged entries and persist the in-memory state."""
+
+        for fh in (self._staged, self._staged_rituals):
+            fh.flush()
+            os.fsync(fh.fileno())
+        title_start = self.last_time - app.CHAIN_TITLE_WINDOW if self.last_time else None
+        state = {
+            "source": self.source,
+            "rows": self.rows,
+            "staged_bytes": self._staged.tell(),
+            "staged_ritual_bytes": self._staged_rituals.tell(),
+            "stamp": self.stamp,
+            "next_id": self.next_id,
+            "last_time": self.last_time.isoformat() if self.last_time else None,
+            "users": self.users,
+            "rollups": app.rollups_to_json(self.rollups),
+            "counts": self.counts,
+            "window": [[t.isoformat(), user] for t, user in self.window],
+            "recent_chains": [[t.isoformat(), sorted(group)] for t, group in self.recent_chains],
+            # users without a chain in the title window no longer need one
+            "user_chains": {
+                user: [t.isoformat() for t in times]
+                for user, times in self.user_chains.items()
+                if times and (title_start is None or times[-1] >= title_start)
+            },
+        }
+        self._write_checkpoint(state)
+
+    def _write_checkpoint(self, state: dict) -> None:
+        tmp = self.checkpoint.with_suffix(".tmp")
+        write_json(tmp, state, compact=True)
+        os.replace(tmp, self.checkpoint)
+
+    # -- replay --------------------------------------------------------------
+
+    def run(
+        self,
+        rows: Iterable[dict],
+        every: int = 10000,
+        progress: Callable[[Importer], None] | None = None,
+    ) -> int:
+        """Import ``rows`` and write the stores. Returns the rows consumed."""
+
+        if self.finishing:
+            self._swap_in()
+            return self.rows
+        rows = iter(rows)
+        n = 0
+        while True:
+            n += 1
+            # parse errors surface from next(), so they get the row number too
+            try:
+                row = next(rows)
+                if n <= self.rows:
+                    continue  # imported before the checkpoint
+                self.add(row)
+            except StopIteration:
+                break
+            except (TypeError, ValueError, csv.Error) as exc:
+                raise ValueError(f"row {n}: {exc}") from exc
+            self.rows = n
+            if n % every == 0:
+                self.save_checkpoint()
+                if progress:
+                    progress(self)
+        self.finish()
+        return self.rows
+
+    def add(self, row: dict) -> None:
+        """Apply one reflection the way the dashboard would."""
+
+        if not isinstance(row, dict):
+            raise ValueError(f"expected an object, got {type(row).__name__}")
+        user = _field(row, "user").strip()
+        content = _field(row, "content").strip()
+        now = _parse_time(_field(row, "timestamp"))
+        public = _parse_bool(row.get("public", False))
+        color = row.get("color") or "#cccccc"
+        if self.last_time and now < self.last_time:
+            raise ValueError("timestamps must be in chronological order")
+        self.last_time = now
+
+        record = self.users.setdefault(user, {})
+        gain, updates = app.score_reflection(record, content, now)
+        entry = {
+            "id": self.next_id,
+            "user": user,
+            "timestamp": now.isoformat(),
+            "content": content,
+            "public": public,
+            "color": color,
+            "xp_gain": gain,
+            "streak": updates["streak"],
+        }
+        updates["recent_reflections"] = app.recent_reflections(record, entry)
+        self._update(user, record.get("xp", 0) + gain, updates)
+        self.next_id += 1
+        self._staged.write((json.dumps(entry) + "\n").encode("utf-8"))
+        app.bump_rollups(self.rollups, now, user, reflections=1, xp_awarded=gain)
+        self.counts[user] = self.counts.get(user, 0) + 1
+
+        self._trim(now)
+        if public:
+            self._enter_window(now, user)
+        self._chain(now)
+
+        if self.counts[user] >= 7:
+            self._unlock(user, "Ritual of Fire", now)
+        if public:
+            self._unlock(user, "Eyes Opened", now)
+
+    def _enter_window(self, now: datetime, user: str) -> None:
+        self.window.append((now, user))
+        self.window_users[user] += 1
+
+    def _trim(self, now: datetime) -> None:
+        window_start = now - app.CHAIN_WINDOW
+        while self.window and self.window[0][0] < window_start:
+            _, user = self.window.popleft()
+            self.window_users[user] -= 1
+            if not self.window_users[user]:
+                del self.window_users[user]
+        while self.recent_chains and self.recent_chains[0][0] < window_start:
+            self.recent_chains.popleft()
+
+    def _index_chain(self, now: datetime, participants) -> None:
+        self.recent_chains.append((now, frozenset(participants)))
+        title_start = now - app.CHAIN_TITLE_WINDOW
+        for p in participants:
+            times = self.user_chains.setdefault(p, deque())
+            while times and times[0] < title_start:
+                times.popleft()
+            times.append(now)
+
+    def _update(self, user: str, xp: int, updates: dict) -> None:
+        record = self.users[user]
+        record.update({"xp": xp, "rank": app.get_rank(xp)[0], "timestamp": self.stamp})
+        record.update(updates)
+
+    def _chain(self, now: datetime) -> None:
+        if len(self.window_users) < app.CHAIN_MIN_PARTICIPANTS:
+            return
+        group = frozenset(self.window_users)
+        # avoid double-counting the same participant set within the window
+        if any(seen == group for _, seen in self.recent_chains):
+            return
+        participants = sorted(group)
+        self._stage_ritual({"type": "ChainRitual", "participants": participants, "timestamp": now.isoformat()})
+        self._index_chain(now, participants)
+        app.bump_rollups(self.rollups, now, chain_rituals=1, xp_awarded=app.CHAIN_XP * len(participants))
+        for p in participants:
+            record = self.users.setdefault(p, {})
+            xp, updates = app.chain_award(record, len(self.user_chains[p]))
+            self._update(p, xp, updates)
+
+    def _unlock(self, user: str, ritual: str, now: datetime) -> None:
+        unlocked = self.users[user].setdefault("rituals", [])
+        if ritual not in unlocked:
+            unlocked.append(ritual)
+            self._stage_ritual({"user": user, "ritual": ritual, "timestamp": now.isoformat()})
+
+    def _stage_ritual(self, event: dict) -> None:
+        self._staged_rituals.write((json.dumps(event) + "\n").encode("utf-8"))
+
+    # -- output --------------------------------------------------------------
+
+    def finish(self) -> None:
+        """Write every store once and swap them in together.
+
+        The new stores are written next to the old ones first. The checkpoint
+        then records that only the swap is left, so a crash part way through
+        the swap can be completed with ``--resume`` without merging the staged
+        rows twice.
+        """
+
+        self._staged.close()
+        self._staged_rituals.close()
+        _merge_staged(app.REFLECTIONS_FILE, self.staging)
+        _merge_staged(app.RITUALS_FILE, self.ritual_staging)
+        write_json(_pending(app.USERS_FILE), self.users)
+        write_json(_pending(app.ROLLUPS_FILE), app.rollups_to_json(self.rollups), compact=True)
+        self._write_checkpoint({"source": self.source, "rows": self.rows, "finishing": True})
+        self._swap_in()
+
+    def _swap_in(self) -> None:
+        for dest in _store_files():
+            pending = _pending(dest)
+            if pending.exists():
+                os.replace(pending, dest)
+        self.staging.unlink(missing_ok=True)
+        self.ritual_staging.unlink(missing_ok=True)
+        self.checkpoint.unlink(missing_ok=True)
+
+
+def _store_files() -> list:
+    return [app.REFLECTIONS_FILE, app.RITUALS_FILE, app.USERS_FILE, app.ROLLUPS_FILE]
+
+
+def _pending(dest: Path) -> Path:
+    """Return where the importer writes the new version of ``dest``."""
+
+    return dest.with_suffix(dest.suffix + ".import")
+
+
+def _merge_staged(dest: Path, staged_path: Path) -> None:
+    """Write ``dest``'s entries plus the staged JSONL ones to its pending file."""
+
+    with _pending(dest).open("w", encoding="utf-8") as out, staged_path.open(encoding="utf-8") as staged:
+        out.write("[")
+        count = 0
+        for item in iter_stored(dest):
+            count = _write_item(out, item, count)
+        for line in staged:
+            count = _write_item(out, json.loads(line), count)
+        out.write("\n]" if count else "]")
+
+
+def _write_item(out: IO[str], item, count: int) -> int:
+    """Write one array item laid out like ``write_json`` does."""
+
+    body = json.dumps(item, indent=2).replace("\n", "\n  ")
+    out.write(("\n  " if count == 0 else ",\n  ") + body)
+    return count + 1
+
+
+# ---------------------------------------------------------------------------
+# Export
+
+def export_reflections(out: IO[str], fmt: str, public_only: bool = False) -> int:
+    """Stream stored reflections to ``out``. Returns the number written."""
+
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+    elif fmt == "json":
+        out.write("[")
+
+    count = 0
+    for ref in iter_stored_reflections():
+        if public_only and not ref.get("public"):
+            continue
+        if writer:
+            writer.writerow(ref)
+        elif fmt == "jsonl":
+            out.write(json.dumps(ref) + "\n")
+        else:
+            out.write(("\n  " if count == 0 else ",\n  ") + json.dumps(ref))
+        count += 1
+
+    if fmt == "json":
+        out.write("\n]\n" if count else "]\n")
+    return count
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m vaultfire", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="replay historical reflections into the stores")
+    imp.add_argument("source", help="JSON array, JSONL or CSV file")
+    imp.add_argument("--format", choices=FORMATS, help="input format (default: from suffix)")
+    imp.add_argument("--checkpoint", type=Path, help="checkpoint file (default: next to the stores)")
+    imp.add_argument("--checkpoint-every", type=int, default=10000, metavar="N",
+                     help="save a checkpoint and report progress every N rows")
+    imp.add_argument("--resume", action="store_true", help="continue from the last checkpoint")
+    imp.add_argument("--quiet", action="store_true", help="do not report progress")
+
+    exp = sub.add_parser("export", help="stream stored reflections to a file")
+    exp.add_argument("dest", help="output file, or - for stdout")
+    exp.add_argument("--format", choices=FORMATS, help="output format (default: from suffix)")
+    exp.add_argument("--public-only", action="store_true", help="only export public reflections")
+    return parser
+
+
+def _run_import(args: argparse.Namespace) -> int:
+    if args.checkpoint_every < 1:
+        raise ValueError("--checkpoint-every must be at least 1")
+    checkpoint = args.checkpoint or app.REFLECTIONS_FILE.with_name("import_checkpoint.json")
+    importer = Importer(Path(args.source), checkpoint)
+    if args.resume:
+        importer.resume()
+    else:
+        if read_json(checkpoint, {}).get("finishing"):
+            raise ValueError("a previous import stopped while writing the stores; rerun with --resume")
+        checkpoint.unlink(missing_ok=True)
+        importer.start()
+
+    def report(imp: Importer) -> None:
+        print(f"{imp.rows} rows imported", file=sys.stderr)
+
+    fmt = detect_format(args.source, args.format)
+    with open(args.source, newline="", encoding="utf-8") as fh:
+        rows = importer.run(iter_rows(fh, fmt), args.checkpoint_every, None if args.quiet else report)
+    if not args.quiet:
+        print(f"done: {rows} rows imported", file=sys.stderr)
+    return 0
+
+
+def _run_export(args: argparse.Namespace) -> int:
+    fmt = detect_format(args.dest, args.format)
+    if args.dest == "-":
+        count = export_reflections(sys.stdout, fmt, args.public_only)
+    else:
+        with open(args.dest, "w", newline="", encoding="utf-8") as out:
+            count = export_reflections(out, fmt, args.public_only)
+    print(f"{count} reflections exported", file=sys.stderr)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "import":
+            return _run_import(args)
+        return _run_export(args)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
@@ -21,6 +21,9 @@ def read_json(path: Path, default: Any) -> Any:
         return default
 
 
-def write_json(path: Path, data: Any) -> None:
-    """Write ``data`` as pretty JSON to ``path``."""
-    path.write_text(json.dumps(data, indent=2))
+def write_json(path: Path, data: Any, *, compact: bool = False) -> None:
+    """Write ``data`` as pretty (or ``compact``) JSON to ``path``."""
+    if compact:
+        path.write_text(json.dumps(data, separators=(",", ":")))
+    else:
+        path.write_text(json.dumps(data, indent=2))